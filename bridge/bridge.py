@@ -6,12 +6,35 @@ Usage:
 
 The binary is located automatically at ../build/traffic_sim relative to this
 script. Override by setting the TRAFFIC_SIM environment variable.
+
+orjson is used for JSON I/O when installed; the stdlib json module is the
+fallback.
 """
 
+import contextlib
 import json
 import os
 import subprocess
 import sys
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def json_loads(data):
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def json_dumps(obj):
+    """Serialize obj to compact UTF-8 bytes."""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode()
 
 
 def find_binary():
@@ -22,50 +45,87 @@ def find_binary():
     return os.path.normpath(os.path.join(script_dir, "..", "build", "traffic_sim"))
 
 
+# Command type -> line-protocol formatter. Unknown types are skipped.
+_FORMATTERS = {
+    "addVehicle": "addVehicle {vehicleId} {startRoad} {endRoad}\n".format_map,
+    "step": "step\n".format_map,
+}
+
+
+def _feed(stdin, commands):
+    """Write commands to the simulator's stdin, then close it.
+
+    A BrokenPipeError means the simulator exited early; run() reports that
+    from the exit status.
+    """
+    with contextlib.suppress(BrokenPipeError):
+        try:
+            for cmd in commands:
+                fmt = _FORMATTERS.get(cmd["type"])
+                if fmt is not None:
+                    stdin.write(fmt(cmd))
+        finally:
+            stdin.close()
+
+
 def run(input_path, output_path):
-    with open(input_path) as f:
-        data = json.load(f)
+    with open(input_path, "rb") as f:
+        data = json_loads(f.read())
 
     commands = data.get("commands", [])
+    # Counting also checks every command has a "type" before the simulator
+    # starts; failing mid-run would leave the feeder blocked on a full pipe.
+    step_count = sum(1 for cmd in commands if cmd["type"] == "step")
 
-    lines = []
-    step_count = 0
-    for cmd in commands:
-        t = cmd["type"]
-        if t == "addVehicle":
-            lines.append(
-                f"addVehicle {cmd['vehicleId']} {cmd['startRoad']} {cmd['endRoad']}\n"
-            )
-        elif t == "step":
-            lines.append("step\n")
-            step_count += 1
-
-    proc = subprocess.run(
+    proc = subprocess.Popen(
         [find_binary()],
-        input="".join(lines),
-        capture_output=True,
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
         text=True,
+        bufsize=1 << 16,
     )
-
-    if proc.returncode != 0:
-        print(f"Simulator error:\n{proc.stderr}", file=sys.stderr)
+    # Feed stdin from a separate thread so the simulator consumes commands
+    # while we drain its output; waiting before stdout is drained could
+    # deadlock on a full pipe.
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        feeding = pool.submit(_feed, proc.stdin, commands)
+        try:
+            step_statuses = [{"leftVehicles": line.split()} for line in proc.stdout]
+            feeding.result()
+        except BaseException:
+            # Killing the simulator unblocks the feeder, so the pool can exit.
+            proc.kill()
+            proc.wait()
+            raise
+
+    returncode = proc.wait()
+    if returncode != 0:
+        print(f"Simulator error: exit status {returncode}", file=sys.stderr)
         sys.exit(1)
 
-    output_lines = proc.stdout.splitlines()
-    if len(output_lines) != step_count:
+    if len(step_statuses) != step_count:
         print(
-            f"Expected {step_count} output lines, got {len(output_lines)}",
+            f"Expected {step_count} output lines, got {len(step_statuses)}",
             file=sys.stderr,
         )
         sys.exit(1)
 
-    step_statuses = []
-    for line in output_lines:
-        step_statuses.append({"leftVehicles": line.split() if line.strip() else []})
-
-    with open(output_path, "w") as f:
-        json.dump({"stepStatuses": step_statuses}, f, indent=2)
-        f.write("\n")
+    write_step_statuses(output_path, step_statuses)
+
+
+def write_step_statuses(output_path, step_statuses):
+    """Write the result document, one compact step status per line."""
+    with open(output_path, "wb") as f:
+        if not step_statuses:
+            f.write(b'{\n  "stepStatuses": []\n}\n')
+            return
+        f.write(b'{\n  "stepStatuses": [\n')
+        last = len(step_statuses) - 1
+        for i, status in enumerate(step_statuses):
+            f.write(b"    ")
+            f.write(json_dumps(status))
+            f.write(b",\n" if i < last else b"\n")
+        f.write(b"  ]\n}\n")
 
 
 if __name__ == "__main__":
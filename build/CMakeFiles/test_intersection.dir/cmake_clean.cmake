@@ -0,0 +1,11 @@
+file(REMOVE_RECURSE
+  "CMakeFiles/test_intersection.dir/tests/test_intersection.c.o"
+  "CMakeFiles/test_intersection.dir/tests/test_intersection.c.o.d"
+  "test_intersection"
+  "test_intersection.pdb"
+)
+
+# Per-language clean rules from dependency scanning.
+foreach(lang C)
+  include(CMakeFiles/test_intersection.dir/cmake_clean_${lang}.cmake OPTIONAL)
+endforeach()
@@ -0,0 +1,11 @@
+file(REMOVE_RECURSE
+  "CMakeFiles/test_road.dir/tests/test_road.c.o"
+  "CMakeFiles/test_road.dir/tests/test_road.c.o.d"
+  "test_road"
+  "test_road.pdb"
+)
+
+# Per-language clean rules from dependency scanning.
+foreach(lang C)
+  include(CMakeFiles/test_road.dir/cmake_clean_${lang}.cmake OPTIONAL)
+endforeach()
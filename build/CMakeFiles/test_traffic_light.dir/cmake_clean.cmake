@@ -0,0 +1,11 @@
+file(REMOVE_RECURSE
+  "CMakeFiles/test_traffic_light.dir/tests/test_traffic_light.c.o"
+  "CMakeFiles/test_traffic_light.dir/tests/test_traffic_light.c.o.d"
+  "test_traffic_light"
+  "test_traffic_light.pdb"
+)
+
+# Per-language clean rules from dependency scanning.
+foreach(lang C)
+  include(CMakeFiles/test_traffic_light.dir/cmake_clean_${lang}.cmake OPTIONAL)
+endforeach()
@@ -0,0 +1,11 @@
+file(REMOVE_RECURSE
+  "CMakeFiles/traffic_sim.dir/src/main.c.o"
+  "CMakeFiles/traffic_sim.dir/src/main.c.o.d"
+  "traffic_sim"
+  "traffic_sim.pdb"
+)
+
+# Per-language clean rules from dependency scanning.
+foreach(lang C)
+  include(CMakeFiles/traffic_sim.dir/cmake_clean_${lang}.cmake OPTIONAL)
+endforeach()
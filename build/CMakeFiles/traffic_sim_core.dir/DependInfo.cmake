@@ -0,0 +1,23 @@
+
+# Consider dependencies only in project.
+set(CMAKE_DEPENDS_IN_PROJECT_ONLY OFF)
+
+# The set of languages for which implicit dependencies are needed:
+set(CMAKE_DEPENDS_LANGUAGES
+  )
+
+# The set of dependency files which are needed:
+set(CMAKE_DEPENDS_DEPENDENCY_FILES
+  "/root/package/src/controller.c" "CMakeFiles/traffic_sim_core.dir/src/controller.c.o" "gcc" "CMakeFiles/traffic_sim_core.dir/src/controller.c.o.d"
+  "/root/package/src/intersection.c" "CMakeFiles/traffic_sim_core.dir/src/intersection.c.o" "gcc" "CMakeFiles/traffic_sim_core.dir/src/intersection.c.o.d"
+  "/root/package/src/road.c" "CMakeFiles/traffic_sim_core.dir/src/road.c.o" "gcc" "CMakeFiles/traffic_sim_core.dir/src/road.c.o.d"
+  "/root/package/src/simulation.c" "CMakeFiles/traffic_sim_core.dir/src/simulation.c.o" "gcc" "CMakeFiles/traffic_sim_core.dir/src/simulation.c.o.d"
+  "/root/package/src/traffic_light.c" "CMakeFiles/traffic_sim_core.dir/src/traffic_light.c.o" "gcc" "CMakeFiles/traffic_sim_core.dir/src/traffic_light.c.o.d"
+  )
+
+# Targets to which this target links.
+set(CMAKE_TARGET_LINKED_INFO_FILES
+  )
+
+# Fortran module output directory.
+set(CMAKE_Fortran_TARGET_MODULE_DIR "")
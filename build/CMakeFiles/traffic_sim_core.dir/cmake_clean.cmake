@@ -0,0 +1,19 @@
+file(REMOVE_RECURSE
+  "CMakeFiles/traffic_sim_core.dir/src/controller.c.o"
+  "CMakeFiles/traffic_sim_core.dir/src/controller.c.o.d"
+  "CMakeFiles/traffic_sim_core.dir/src/intersection.c.o"
+  "CMakeFiles/traffic_sim_core.dir/src/intersection.c.o.d"
+  "CMakeFiles/traffic_sim_core.dir/src/road.c.o"
+  "CMakeFiles/traffic_sim_core.dir/src/road.c.o.d"
+  "CMakeFiles/traffic_sim_core.dir/src/simulation.c.o"
+  "CMakeFiles/traffic_sim_core.dir/src/simulation.c.o.d"
+  "CMakeFiles/traffic_sim_core.dir/src/traffic_light.c.o"
+  "CMakeFiles/traffic_sim_core.dir/src/traffic_light.c.o.d"
+  "libtraffic_sim_core.a"
+  "libtraffic_sim_core.pdb"
+)
+
+# Per-language clean rules from dependency scanning.
+foreach(lang C)
+  include(CMakeFiles/traffic_sim_core.dir/cmake_clean_${lang}.cmake OPTIONAL)
+endforeach()
@@ -0,0 +1,3 @@
+file(REMOVE_RECURSE
+  "libtraffic_sim_core.a"
+)
@@ -0,0 +1,14 @@
+# CMake generated Testfile for 
+# Source directory: /root/package
+# Build directory: /root/package/build
+# 
+# This file includes the relevant testing commands required for 
+# testing this directory and lists subdirectories to be tested as well.
+add_test(test_road "/root/package/build/test_road")
+set_tests_properties(test_road PROPERTIES  _BACKTRACE_TRIPLES "/root/package/CMakeLists.txt;35;add_test;/root/package/CMakeLists.txt;0;")
+add_test(test_traffic_light "/root/package/build/test_traffic_light")
+set_tests_properties(test_traffic_light PROPERTIES  _BACKTRACE_TRIPLES "/root/package/CMakeLists.txt;35;add_test;/root/package/CMakeLists.txt;0;")
+add_test(test_controller "/root/package/build/test_controller")
+set_tests_properties(test_controller PROPERTIES  _BACKTRACE_TRIPLES "/root/package/CMakeLists.txt;35;add_test;/root/package/CMakeLists.txt;0;")
+add_test(test_intersection "/root/package/build/test_intersection")
+set_tests_properties(test_intersection PROPERTIES  _BACKTRACE_TRIPLES "/root/package/CMakeLists.txt;35;add_test;/root/package/CMakeLists.txt;0;")
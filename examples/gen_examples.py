@@ -3,8 +3,24 @@
 Generate large, complex traffic simulation examples.
 Run once from the project root:
     python3 examples/gen_examples.py
+
+With --lp the scenarios are written as line-protocol .lp files instead,
+ready to pipe straight into the binary without the bridge:
+    python3 examples/gen_examples.py --lp
+    ./build/traffic_sim < examples/08_wave_attack.lp
 """
-import json, random, pathlib
+import argparse, json, random, pathlib
+
+try:
+    import orjson                 # optional, much faster than stdlib json
+except ImportError:
+    orjson = None
+
+def dumps(obj):
+    """Indented JSON as UTF-8 bytes (orjson when available, else stdlib)."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+    return json.dumps(obj, indent=2).encode()
 
 OUT = pathlib.Path(__file__).parent
 rng = random.Random(42)          # fixed seed → reproducible examples
@@ -17,29 +33,65 @@ EW_LEFT     = [("east","south"), ("west","north")]
 NS_RIGHT    = [("north","west"), ("south","east")]
 EW_RIGHT    = [("east","north"), ("west","south")]
 ALL_MOVES   = NS_STRAIGHT + EW_STRAIGHT + NS_LEFT + EW_LEFT + NS_RIGHT + EW_RIGHT
+STRAIGHT    = NS_STRAIGHT + EW_STRAIGHT
+LEFT        = NS_LEFT + EW_LEFT
+RIGHT       = NS_RIGHT + EW_RIGHT
 
 # ── helpers ─────────────────────────────────────────────────────────────────
 _ctr = 0
-def vid(tag="v"):
-    global _ctr; _ctr += 1
-    return f"{tag}_{_ctr:05d}"
-
-def av(start, end, tag="v"):
-    return {"type":"addVehicle","vehicleId":vid(tag),"startRoad":start,"endRoad":end}
 
+# Commands are kept as (vehicleId, startRoad, endRoad) tuples plus the STEP
+# marker; save() turns them into JSON dicts or protocol lines.
 def add_batch(cmds, pool, n, tag="v"):
-    for _ in range(n):
-        s, e = rng.choice(pool)
-        cmds.append(av(s, e, tag))
-
-STEP = {"type": "step"}
-
-def save(name, meta, commands):
-    doc = {"_scenario": name, "_description": meta, "commands": commands}
-    p = OUT / name
-    p.write_text(json.dumps(doc, indent=2))
-    n_add  = sum(1 for c in commands if c["type"] == "addVehicle")
-    n_step = sum(1 for c in commands if c["type"] == "step")
+    global _ctr
+    base, _ctr = _ctr, _ctr + n
+    # one rng.choice per vehicle keeps the seeded examples byte-identical
+    choice = rng.choice
+    cmds.extend((f"{tag}_{base + i:05d}", *choice(pool)) for i in range(1, n + 1))
+
+STEP = "step"
+_STEP_DICT = {"type": "step"}
+
+def as_dict(c):
+    if c is STEP:
+        return _STEP_DICT
+    v, s, e = c
+    return {"type":"addVehicle","vehicleId":v,"startRoad":s,"endRoad":e}
+
+def as_line(c):
+    return "step\n" if c is STEP else "addVehicle %s %s %s\n" % c
+
+# Same layout as dumps(); ids and road names never need JSON escaping.
+_JSON_VEHICLE = ('    {{\n      "type": "addVehicle",\n      "vehicleId": "{}",\n'
+                 '      "startRoad": "{}",\n      "endRoad": "{}"\n    }}').format
+_JSON_STEP = '    {\n      "type": "step"\n    }'
+STREAM_THRESHOLD = 10_000       # commands; above this, skip the dict list
+
+def write_json_stream(path, name, meta, commands):
+    """Write the scenario JSON straight from command tuples."""
+    with path.open("w", encoding="utf-8") as f:
+        f.write('{\n  "_scenario": %s,\n  "_description": %s,\n  "commands": ['
+                % (json.dumps(name, ensure_ascii=False), json.dumps(meta, ensure_ascii=False)))
+        sep = "\n"
+        for c in commands:
+            f.write(sep)
+            f.write(_JSON_STEP if c is STEP else _JSON_VEHICLE(*c))
+            sep = ",\n"
+        f.write("\n  ]\n}" if commands else "]\n}")
+
+def save(name, meta, commands, fmt="json"):
+    if fmt == "lp":
+        name = str(pathlib.PurePath(name).with_suffix(".lp"))
+        with (OUT / name).open("w") as f:
+            f.writelines(map(as_line, commands))
+    elif len(commands) > STREAM_THRESHOLD:
+        write_json_stream(OUT / name, name, meta, commands)
+    else:
+        doc = {"_scenario": name, "_description": meta,
+               "commands": [as_dict(c) for c in commands]}
+        (OUT / name).write_bytes(dumps(doc))
+    n_step = commands.count(STEP)
+    n_add  = len(commands) - n_step
     print(f"  {name}: {n_step} steps, {n_add} vehicles")
 
 
@@ -68,7 +120,7 @@ def gen_morning_rush():
         if i % 6  == 0: add_batch(cmds, NS_STRAIGHT, 1, "ns2")
         if i % 18 == 0: add_batch(cmds, EW_LEFT,     2, "el2")
         if i % 30 == 0: add_batch(cmds, NS_LEFT,     1, "nl2")
-        if i % 50 == 0: add_batch(cmds, NS_RIGHT + EW_RIGHT, 2, "rt")
+        if i % 50 == 0: add_batch(cmds, RIGHT, 2, "rt")
         cmds.append(STEP)
 
     return cmds
@@ -83,16 +135,13 @@ def gen_morning_rush():
 import math
 def gen_chaos():
     cmds = []
-    for i in range(1, 401):
-        # base rate oscillates between 1 and 6 vehicles per step
-        rate = max(1, round(3 + 3 * math.sin(i * math.pi / 40)))
-        for _ in range(rate):
-            s, e = rng.choice(ALL_MOVES)
-            cmds.append(av(s, e, "ch"))
+    # base rate oscillates between 1 and 6 vehicles per step
+    rates = [max(1, round(3 + 3 * math.sin(i * math.pi / 40))) for i in range(1, 401)]
+    for i, rate in enumerate(rates, 1):
+        add_batch(cmds, ALL_MOVES, rate, "ch")
         # every 5 steps inject a left-turn burst to keep arrow phases alive
         if i % 5 == 0:
-            s, e = rng.choice(NS_LEFT + EW_LEFT)
-            cmds.append(av(s, e, "lt"))
+            add_batch(cmds, LEFT, 1, "lt")
         cmds.append(STEP)
     return cmds
 
@@ -115,10 +164,10 @@ def gen_waves():
             elif wave_num == 1:
                 add_batch(cmds, EW_STRAIGHT, 40, "wew")
             elif wave_num == 2:
-                add_batch(cmds, NS_STRAIGHT + EW_STRAIGHT, 30, "wmix")
-                add_batch(cmds, NS_RIGHT + EW_RIGHT, 10, "wrt")
+                add_batch(cmds, STRAIGHT, 30, "wmix")
+                add_batch(cmds, RIGHT, 10, "wrt")
             else:
-                add_batch(cmds, NS_LEFT + EW_LEFT, 20, "wlt")
+                add_batch(cmds, LEFT, 20, "wlt")
                 add_batch(cmds, NS_STRAIGHT, 10, "wns2")
                 add_batch(cmds, EW_STRAIGHT, 10, "wew2")
         cmds.append(STEP)
@@ -145,31 +194,36 @@ def gen_left_siege():
             add_batch(cmds, EW_LEFT, 3, "lt")
         # Occasional right-turn noise
         if i % 17 == 0:
-            add_batch(cmds, NS_RIGHT + EW_RIGHT, 2, "rt")
+            add_batch(cmds, RIGHT, 2, "rt")
         cmds.append(STEP)
     return cmds
 
 
 # ── main ────────────────────────────────────────────────────────────────────
+ap = argparse.ArgumentParser(description="Generate the large example scenarios.")
+ap.add_argument("--lp", action="store_true",
+                help="write line-protocol .lp files instead of JSON")
+FMT = "lp" if ap.parse_args().lp else "json"
+
 print("Generating examples…")
 save("06_morning_rush.json",
      "Two-phase commuter rush: NS-dominant for 150 steps, EW surge for 150 more. "
      "Left-turners trickle throughout and must fight for arrow phases.",
-     gen_morning_rush())
+     gen_morning_rush(), FMT)
 
 save("07_all_directions_chaos.json",
      "400 steps of sinusoidally varying random arrivals from every road and movement "
      "type. All four phases compete dynamically throughout.",
-     gen_chaos())
+     gen_chaos(), FMT)
 
 save("08_wave_attack.json",
      "500 steps. Traffic arrives in waves of 40 vehicles every 25 steps, alternating "
      "NS / EW / mixed / arrow. Controller must repeatedly absorb large bursts.",
-     gen_waves())
+     gen_waves(), FMT)
 
 save("09_left_turn_siege.json",
      "350 steps of constant straight-lane pressure (4 vehicles/step) with left-turn "
      "clusters every 10 steps. Demonstrates anti-starvation guarantee under load.",
-     gen_left_siege())
+     gen_left_siege(), FMT)
 
 print("Done.")
@@ -45,15 +45,17 @@ app.add_middleware(
 # ---------------------------------------------------------------------------
 # API routes
 # ---------------------------------------------------------------------------
+# Routes that talk to the simulator are plain ``def`` so FastAPI runs them in
+# its threadpool: the blocking subprocess I/O then never stalls the event loop.
 
 @app.get("/api/state", response_model=IntersectionState)
-async def get_state():
+def get_state():
     """Return the current intersection state (light phases, queue lengths)."""
     return simulator.state()
 
 
 @app.post("/api/vehicles", status_code=201)
-async def add_vehicle(req: AddVehicleRequest):
+def add_vehicle(req: AddVehicleRequest):
     """Add a vehicle to a lane queue.
 
     - `start_road` and `end_road` must differ.
@@ -65,8 +67,20 @@ async def add_vehicle(req: AddVehicleRequest):
     return {"ok": True, "vehicle_id": f"Car{req.vehicle_id}"}
 
 
+@app.post("/api/vehicles/bulk", status_code=201)
+def add_vehicles(reqs: list[AddVehicleRequest]):
+    """Add several vehicles in one request, in order.
+
+    The whole batch is rejected if any vehicle would make a U-turn.
+    """
+    if any(req.start_road == req.end_road for req in reqs):
+        raise HTTPException(status_code=422, detail="U-turns are not allowed")
+    simulator.add_vehicles(reqs)
+    return {"ok": True, "vehicle_ids": [f"Car{req.vehicle_id}" for req in reqs]}
+
+
 @app.post("/api/step", response_model=StepResponse)
-async def step():
+def step():
     """Advance the simulation by one step.
 
     Returns the list of vehicle IDs that departed during this step.
@@ -78,7 +92,7 @@ async def step():
 
 
 @app.post("/api/reset", response_model=ResetResponse)
-async def reset():
+def reset():
     """Reset the simulation to the initial state."""
     simulator.reset()
     return ResetResponse(ok=True)
@@ -7,6 +7,8 @@ from typing import Annotated
 
 from pydantic import BaseModel, Field, field_validator
 
+from .validation import VEHICLE_ID_MAX_LEN, validate_vehicle_id
+
 # ---------------------------------------------------------------------------
 # Domain enums (mirror types.h)
 # ---------------------------------------------------------------------------
@@ -43,16 +45,14 @@ class Phase(IntEnum):
 # ---------------------------------------------------------------------------
 
 class AddVehicleRequest(BaseModel):
-    vehicle_id: Annotated[str, Field(min_length=1, max_length=31)]
+    vehicle_id: Annotated[str, Field(min_length=1, max_length=VEHICLE_ID_MAX_LEN)]
     start_road: RoadDir
     end_road: RoadDir
 
     @field_validator("vehicle_id")
     @classmethod
     def no_whitespace(cls, v: str) -> str:
-        if any(c.isspace() for c in v):
-            raise ValueError("vehicle_id must not contain whitespace")
-        return v
+        return validate_vehicle_id(v)
 
 
 class StepResponse(BaseModel):
@@ -4,7 +4,8 @@ The C binary reads one command per line from stdin and writes one line per
 'step' command to stdout.  We keep the process alive between API calls so
 simulation state is preserved across requests.
 
-Thread safety: a single asyncio.Lock serialises all subprocess I/O.
+Thread safety: API handlers run in FastAPI's threadpool, and a single
+threading.Lock serialises all subprocess I/O and state updates.
 """
 
 from __future__ import annotations
@@ -66,9 +67,19 @@ _ROAD_NAMES = {RoadDir.NORTH: "north", RoadDir.SOUTH: "south",
                RoadDir.EAST: "east", RoadDir.WEST: "west"}
 _LANE_NAMES = {Lane.LEFT: "left", Lane.STRAIGHT: "straight", Lane.RIGHT: "right"}
 
-# Phases that activate N+S / E+W
-_NS_PHASES = {Phase.NS, Phase.NS_ARROW}
-_EW_PHASES = {Phase.EW, Phase.EW_ARROW}
+# Enum members in value order; iterating a tuple avoids EnumMeta.__iter__
+_ALL_ROADS = (RoadDir.NORTH, RoadDir.SOUTH, RoadDir.EAST, RoadDir.WEST)
+_ALL_LANES = (Lane.LEFT, Lane.STRAIGHT, Lane.RIGHT)
+
+# Phase -> (roads served, lanes served).  Left-turn lanes only move on the
+# arrow phases; straight and right lanes share the main phase.
+_PHASE_ACTIVE: dict[Phase, tuple[tuple[RoadDir, ...], tuple[Lane, ...]]] = {
+    Phase.NS:       ((RoadDir.NORTH, RoadDir.SOUTH), (Lane.STRAIGHT, Lane.RIGHT)),
+    Phase.EW:       ((RoadDir.EAST, RoadDir.WEST),   (Lane.STRAIGHT, Lane.RIGHT)),
+    Phase.NS_ARROW: ((RoadDir.NORTH, RoadDir.SOUTH), (Lane.LEFT,)),
+    Phase.EW_ARROW: ((RoadDir.EAST, RoadDir.WEST),   (Lane.LEFT,)),
+}
+_ARROW_PHASES = frozenset({Phase.NS_ARROW, Phase.EW_ARROW})
 
 # Steps (from config.h)
 MIN_GREEN_STEPS = 2
@@ -76,34 +87,64 @@ MAX_GREEN_STEPS = 8
 YELLOW_STEPS    = 1
 
 
+_OPPOSITES = {RoadDir.NORTH: RoadDir.SOUTH, RoadDir.SOUTH: RoadDir.NORTH,
+              RoadDir.EAST: RoadDir.WEST,   RoadDir.WEST: RoadDir.EAST}
+_RIGHTS = {RoadDir.NORTH: RoadDir.WEST, RoadDir.SOUTH: RoadDir.EAST,
+           RoadDir.EAST: RoadDir.NORTH, RoadDir.WEST: RoadDir.SOUTH}
+
+
+def _build_lane_table() -> dict[tuple[RoadDir, RoadDir], Lane | None]:
+    table: dict[tuple[RoadDir, RoadDir], Lane | None] = {}
+    for start in _ALL_ROADS:
+        for end in _ALL_ROADS:
+            if start == end:
+                table[start, end] = None  # invalid
+            elif end == _OPPOSITES[start]:
+                table[start, end] = Lane.STRAIGHT
+            elif end == _RIGHTS[start]:
+                table[start, end] = Lane.RIGHT
+            else:
+                table[start, end] = Lane.LEFT
+    return table
+
+
+# (start, end) -> lane, built once at import
+_LANE_TABLE = _build_lane_table()
+
+
+_N_LANES = len(_ALL_LANES)
+
+
+def _queue_index(road: RoadDir, lane: Lane) -> int:
+    """Index of a (road, lane) counter in the flat SimulatorState.queues list."""
+    return road * _N_LANES + lane
+
+
+# Phase -> queues[] indices that may discharge a vehicle
+_PHASE_DEPARTED_IDX: dict[Phase, tuple[int, ...]] = {
+    phase: tuple(_queue_index(road, lane) for road in roads for lane in lanes)
+    for phase, (roads, lanes) in _PHASE_ACTIVE.items()
+}
+
+
 def _movement_for(start: RoadDir, end: RoadDir) -> Lane | None:
     """Return which lane the vehicle occupies based on start/end roads."""
-    opposites = {RoadDir.NORTH: RoadDir.SOUTH, RoadDir.SOUTH: RoadDir.NORTH,
-                 RoadDir.EAST: RoadDir.WEST,   RoadDir.WEST: RoadDir.EAST}
-    rights = {RoadDir.NORTH: RoadDir.WEST, RoadDir.SOUTH: RoadDir.EAST,
-              RoadDir.EAST: RoadDir.NORTH, RoadDir.WEST: RoadDir.SOUTH}
-    if start == end:
-        return None  # invalid
-    if end == opposites[start]:
-        return Lane.STRAIGHT
-    if end == rights[start]:
-        return Lane.RIGHT
-    return Lane.LEFT
+    return _LANE_TABLE[start, end]
 
 
 class SimulatorState:
     """Pure-Python mirror of intersection state, updated on each API call."""
 
     def __init__(self) -> None:
-        # queues[road][lane] = count
-        self.queues: dict[RoadDir, dict[Lane, int]] = {
-            road: {lane: 0 for lane in Lane} for road in RoadDir
-        }
+        # queues[_queue_index(road, lane)] = count, one flat row per road
+        self.queues: list[int] = [0] * (len(_ALL_ROADS) * _N_LANES)
         self.step_count: int = 0
         self.current_phase: Phase = Phase.NS
         self.phase_steps: int = 0          # steps spent in current phase
         self.in_yellow: bool = False
         self.yellow_from_phase: Phase = Phase.NS
+        # Last snapshot(); cleared by every update so polling is cheap
+        self._snapshot_cache: IntersectionState | None = None
 
     # ------------------------------------------------------------------
     # Updates
@@ -113,14 +154,22 @@ class SimulatorState:
         lane = _movement_for(req.start_road, req.end_road)
         if lane is None:
             return
-        self.queues[req.start_road][lane] += 1
+        self.queues[_queue_index(req.start_road, lane)] += 1
+        self._snapshot_cache = None
+
+    def apply_step(self, left_vehicles: list[str], departed_phase: Phase | None) -> None:
+        """Update state after a step.
 
-    def apply_step(self, left_vehicles: list[str], departed_meta: list[tuple[RoadDir, Lane]]) -> None:
-        """Update state after a step.  departed_meta is computed at step-issue time."""
+        departed_phase is the phase that was green at step-issue time, or
+        None if the step ran during a yellow transition (no departures).
+        """
         self.step_count += 1
-        for road, lane in departed_meta:
-            if self.queues[road][lane] > 0:
-                self.queues[road][lane] -= 1
+        self._snapshot_cache = None
+        if departed_phase is not None:
+            queues = self.queues
+            for i in _PHASE_DEPARTED_IDX[departed_phase]:
+                if queues[i] > 0:
+                    queues[i] -= 1
 
         # Advance phase mirror
         if self.in_yellow:
@@ -137,11 +186,7 @@ class SimulatorState:
                 # Only count lanes that are actually served by the current phase;
                 # left-turn vehicles wait for the ARROW phase and must not block
                 # early termination of the straight/right phase.
-                active = self._active_roads(self.current_phase)
-                if self.current_phase in {Phase.NS_ARROW, Phase.EW_ARROW}:
-                    phase_lanes: list[Lane] = [Lane.LEFT]
-                else:
-                    phase_lanes = [Lane.STRAIGHT, Lane.RIGHT]
+                active, phase_lanes = _PHASE_ACTIVE[self.current_phase]
                 if self._queues_empty(active, phase_lanes) and self.phase_steps >= MIN_GREEN_STEPS:
                     self._start_yellow()
 
@@ -149,18 +194,16 @@ class SimulatorState:
         self.in_yellow = True
         self.yellow_from_phase = self.current_phase
 
-    def _active_roads(self, phase: Phase) -> list[RoadDir]:
-        if phase in _NS_PHASES:
-            return [RoadDir.NORTH, RoadDir.SOUTH]
-        return [RoadDir.EAST, RoadDir.WEST]
+    def _active_roads(self, phase: Phase) -> tuple[RoadDir, ...]:
+        return _PHASE_ACTIVE[phase][0]
 
-    def _queues_empty(self, roads: list[RoadDir], lanes: list[Lane] | None = None) -> bool:
-        check_lanes = lanes if lanes is not None else list(Lane)
-        for road in roads:
-            for lane in check_lanes:
-                if self.queues[road][lane] > 0:
-                    return False
-        return True
+    def _queues_empty(self, roads: tuple[RoadDir, ...],
+                      lanes: tuple[Lane, ...] | None = None) -> bool:
+        check_lanes = lanes if lanes is not None else _ALL_LANES
+        queues = self.queues
+        return not any(
+            queues[_queue_index(road, lane)] for road in roads for lane in check_lanes
+        )
 
     # ------------------------------------------------------------------
     # Light state derivation
@@ -173,43 +216,52 @@ class SimulatorState:
         else:
             active = self._active_roads(self.current_phase)
             if road in active:
-                if self.current_phase in {Phase.NS_ARROW, Phase.EW_ARROW}:
+                if self.current_phase in _ARROW_PHASES:
                     state = LightState.GREEN_ARROW
                 else:
                     state = LightState.GREEN
             else:
                 state = LightState.RED
         remaining = max(0, MAX_GREEN_STEPS - self.phase_steps)
-        return LightInfo(state=state, steps_remaining=remaining)
+        return LightInfo.model_construct(state=state, steps_remaining=remaining)
 
     # ------------------------------------------------------------------
     # Snapshot
     # ------------------------------------------------------------------
 
     def snapshot(self) -> IntersectionState:
+        if self._snapshot_cache is not None:
+            return self._snapshot_cache
+        # Values are already typed; model_construct skips Pydantic validation.
         roads: list[RoadInfo] = []
-        for road in RoadDir:
+        for road in _ALL_ROADS:
             lanes = {
-                _LANE_NAMES[lane]: LaneInfo(queue_length=self.queues[road][lane])
-                for lane in Lane
+                _LANE_NAMES[lane]: LaneInfo.model_construct(
+                    queue_length=self.queues[_queue_index(road, lane)])
+                for lane in _ALL_LANES
             }
-            roads.append(RoadInfo(
+            roads.append(RoadInfo.model_construct(
                 direction=road,
                 light=self.light_for(road),
                 lanes=lanes,
             ))
-        return IntersectionState(
+        self._snapshot_cache = IntersectionState.model_construct(
             step_count=self.step_count,
             current_phase=self.current_phase,
             in_yellow_transition=self.in_yellow,
             roads=roads,
         )
+        return self._snapshot_cache
 
 
 # ---------------------------------------------------------------------------
 # Subprocess manager
 # ---------------------------------------------------------------------------
 
+def _add_vehicle_line(req: AddVehicleRequest) -> str:
+    return f"addVehicle {req.vehicle_id} {_ROAD_NAMES[req.start_road]} {_ROAD_NAMES[req.end_road]}\n"
+
+
 class SimulatorProcess:
     """Manages the long-running traffic_sim process."""
 
@@ -250,36 +302,30 @@ class SimulatorProcess:
     def add_vehicle(self, req: AddVehicleRequest) -> None:
         with self._lock:
             self._start()
-            line = f"addVehicle {req.vehicle_id} {req.start_road.name.lower()} {req.end_road.name.lower()}\n"
-            self._send(line)
+            self._send(_add_vehicle_line(req))
             self._state.add_vehicle(req)
 
+    def add_vehicles(self, reqs: list[AddVehicleRequest]) -> None:
+        """Add several vehicles with a single write to the subprocess."""
+        with self._lock:
+            self._start()
+            self._send("".join(_add_vehicle_line(req) for req in reqs))
+            for req in reqs:
+                self._state.add_vehicle(req)
+
     def step(self) -> StepResponse:
         with self._lock:
             self._start()
             # Snapshot which roads/lanes are active before stepping so we know
             # which queues to decrement when vehicles depart.
-            phase = self._state.current_phase
-            if self._state.in_yellow:
-                # During yellow transition no vehicles depart
-                departed_meta: list[tuple[RoadDir, Lane]] = []
-            else:
-                active_roads = self._state._active_roads(phase)
-                if phase in {Phase.NS_ARROW, Phase.EW_ARROW}:
-                    active_lanes = [Lane.LEFT]
-                else:
-                    active_lanes = [Lane.STRAIGHT, Lane.RIGHT]
-                departed_meta = [
-                    (road, lane)
-                    for road in active_roads
-                    for lane in active_lanes
-                ]
+            # During yellow transition no vehicles depart.
+            departed_phase = None if self._state.in_yellow else self._state.current_phase
 
             self._send("step\n")
             raw = self._recv_line()
-            left = raw.split() if raw.strip() else []
+            left = raw.split()
 
-            self._state.apply_step(left, departed_meta)
+            self._state.apply_step(left, departed_phase)
             return StepResponse(
                 left_vehicles=left,
                 step_number=self._state.step_count,
@@ -0,0 +1,160 @@
+"""Shared fixtures for the API tests."""
+
+from __future__ import annotations
+
+from functools import lru_cache
+from os import environ
+from pathlib import Path
+from types import SimpleNamespace
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+from app.simulator import simulator
+from app.validation import validate_vehicle_id
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+_HERE = Path(__file__).resolve()
+# The directory holding this checkout (parents[4] is the repo root); the
+# default expects a traffic_sim/ checkout next to it, as the original skip
+# check did.
+_CHECKOUT_PARENT = _HERE.parents[5]
+_DEFAULT_BIN = _CHECKOUT_PARENT / "traffic_sim" / "build" / "traffic_sim"
+# An empty TRAFFIC_SIM counts as unset, as in simulator._find_binary.
+BINARY_PATH = environ.get("TRAFFIC_SIM") or str(_DEFAULT_BIN)
+
+
+@lru_cache(maxsize=1)
+def binary_available() -> bool:
+    return Path(BINARY_PATH).is_file()
+
+
+# Skip a module if binary is missing and TRAFFIC_SIM is not set
+requires_binary = pytest.mark.skipif(
+    not binary_available(),
+    reason="traffic_sim binary not built; run cmake --build traffic_sim/build first",
+)
+
+
+def roads_by_dir(state: dict) -> dict[int, dict]:
+    """Index the ``roads`` list of a state response by direction."""
+    return {road["direction"]: road for road in state["roads"]}
+
+
+# Pre-encoded POST /api/vehicles body; ids must not need JSON escaping.
+_ADD_VEHICLE_BODY = b'{"vehicle_id":"%s","start_road":%d,"end_road":%d}'
+_JSON_HEADERS = {"content-type": "application/json"}
+
+
+def add_vehicle(post, vehicle_id: str, start: int, end: int, *, validate: bool = True):
+    """Add a vehicle through ``post`` (a client or mutating post callable).
+
+    Invalid ids fail fast with ValueError before any request is sent unless
+    ``validate`` is False.
+    """
+    if validate:
+        validate_vehicle_id(vehicle_id)
+    body = _ADD_VEHICLE_BODY % (vehicle_id.encode(), start, end)
+    return post("/api/vehicles", content=body, headers=_JSON_HEADERS)
+
+
+@pytest.fixture(scope="session", autouse=True)
+def _orjson_responses():
+    """Decode ``Response.json()`` with orjson when it is installed."""
+    if orjson is None:
+        yield
+        return
+    stdlib_json = httpx.Response.json
+
+    def json(self, **kwargs):
+        if kwargs:
+            return stdlib_json(self, **kwargs)
+        return orjson.loads(self.content)
+
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(httpx.Response, "json", json)
+        yield
+
+
+@pytest.fixture(scope="session")
+def client():
+    from app.main import app
+    with TestClient(app) as c:
+        yield c
+
+
+@pytest.fixture(scope="session", autouse=True)
+def _warmup(client):
+    """Pay the lifespan startup and first-request costs before any test runs."""
+    client.get("/api/state")
+
+
+@pytest.fixture(scope="session")
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.fixture(scope="session")
+async def async_client():
+    """In-process ASGI client; one connection pool for the whole session."""
+    from app.main import app
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as c:
+        yield c
+
+
+# Set when a test left the simulation dirty; cleared by the next reset.
+_needs_reset = [False]
+
+
+@pytest.fixture(autouse=True)
+def reset_between_tests(client):
+    """Give each test a clean simulation, resetting only when needed.
+
+    Tests flag themselves dirty through the ``mutating_post`` fixture.  The
+    reset runs lazily in the next test's setup, so the session's last test
+    is never reset for nothing.  It is an in-process call;
+    test_reset_clears_state covers the endpoint.
+    """
+    if _needs_reset[0]:
+        simulator.reset()
+        _needs_reset[0] = False
+    token = SimpleNamespace(dirty=False)
+    yield token
+    if token.dirty:
+        _needs_reset[0] = True
+
+
+@pytest.fixture
+def mutating_post(client, reset_between_tests):
+    """``client.post`` for requests that may change simulation state."""
+    def post(url: str, **kwargs):
+        reset_between_tests.dirty = True
+        return client.post(url, **kwargs)
+    return post
+
+
+@pytest.fixture
+def async_mutating_post(async_client, reset_between_tests):
+    """Async counterpart of ``mutating_post``."""
+    async def post(url: str, **kwargs):
+        reset_between_tests.dirty = True
+        return await async_client.post(url, **kwargs)
+    return post
+
+
+@pytest.fixture
+def run_step(reset_between_tests):
+    """Advance the simulation in-process, bypassing the HTTP layer."""
+    from app.main import step
+
+    def run():
+        reset_between_tests.dirty = True
+        return step()
+    return run
@@ -3,152 +3,141 @@
 These tests require the traffic_sim binary to be built.  The binary path can
 be overridden via the TRAFFIC_SIM environment variable.
 
+Tests that only inspect state call the route functions in app.main directly;
+the HTTP client is kept for behaviour that depends on routing, validation
+and status codes.
+
 Run with:
     pytest web/backend/app/tests/
+
+Tests are independent, so with pytest-xdist installed (optional, not in
+requirements.txt) they can be spread over workers with ``pytest -n auto``.
+Each worker is its own process with its own app and traffic_sim subprocess,
+so no extra isolation is needed.
 """
 
 from __future__ import annotations
 
-from os import environ
-
 import pytest
-from fastapi.testclient import TestClient
-
-# Skip all tests if binary is missing and TRAFFIC_SIM is not set
-BINARY_PATH = environ.get(
-    "TRAFFIC_SIM",
-    str(__file__).replace(
-        "web/backend/app/tests/test_api.py",
-        "traffic_sim/build/traffic_sim",
-    ),
-)
-
-
-def binary_available() -> bool:
-    env = environ.get("TRAFFIC_SIM")
-    if env:
-        import os.path
-        return os.path.isfile(env)
-    from pathlib import Path
-    here = Path(__file__).resolve()
-    candidate = here.parents[5] / "traffic_sim" / "build" / "traffic_sim"
-    return candidate.is_file()
-
-
-pytestmark = pytest.mark.skipif(
-    not binary_available(),
-    reason="traffic_sim binary not built; run cmake --build traffic_sim/build first",
-)
 
+from app.main import get_state
 
-@pytest.fixture(autouse=True)
-def reset_between_tests(client):
-    yield
-    client.post("/api/reset")
+from .conftest import add_vehicle, requires_binary, roads_by_dir
 
-
-@pytest.fixture(scope="module")
-def client():
-    from app.main import app
-    with TestClient(app) as c:
-        yield c
+pytestmark = requires_binary
 
 
 # ---------------------------------------------------------------------------
 # State endpoint
 # ---------------------------------------------------------------------------
 
-def test_initial_state(client):
-    resp = client.get("/api/state")
-    assert resp.status_code == 200
-    data = resp.json()
-    assert data["step_count"] == 0
-    assert data["current_phase"] == 0     # PHASE_NS
-    assert not data["in_yellow_transition"]
-    assert len(data["roads"]) == 4
-    for road in data["roads"]:
-        for lane_info in road["lanes"].values():
-            assert lane_info["queue_length"] == 0
+def test_initial_state():
+    state = get_state()
+    assert state.step_count == 0
+    assert state.current_phase == 0     # PHASE_NS
+    assert not state.in_yellow_transition
+    assert len(state.roads) == 4
+    for road in state.roads:
+        for lane_info in road.lanes.values():
+            assert lane_info.queue_length == 0
 
 
 # ---------------------------------------------------------------------------
 # Add vehicle
 # ---------------------------------------------------------------------------
 
-def test_add_vehicle_increments_queue(client):
-    resp = client.post("/api/vehicles", json={
-        "vehicle_id": "v1",
-        "start_road": 0,   # NORTH
-        "end_road":   1,   # SOUTH  -> straight lane
-    })
+@pytest.mark.parametrize("start, end, lane", [
+    (0, 1, "straight"),   # NORTH -> SOUTH
+    (2, 1, "left"),       # EAST  -> SOUTH
+    (0, 3, "right"),      # NORTH -> WEST
+], ids=["straight", "left", "right"])
+def test_add_vehicle_increments_queue(client, mutating_post, start, end, lane):
+    resp = add_vehicle(mutating_post, "v1", start, end)
     assert resp.status_code == 201
 
     state = client.get("/api/state").json()
-    north = next(r for r in state["roads"] if r["direction"] == 0)
-    assert north["lanes"]["straight"]["queue_length"] == 1
+    assert roads_by_dir(state)[start]["lanes"][lane]["queue_length"] == 1
 
 
-def test_add_vehicle_left_turn(client):
-    client.post("/api/vehicles", json={"vehicle_id": "lt1", "start_road": 2, "end_road": 1})
-    state = client.get("/api/state").json()
-    east = next(r for r in state["roads"] if r["direction"] == 2)
-    assert east["lanes"]["left"]["queue_length"] == 1
+def test_uturn_rejected(client):
+    resp = add_vehicle(client.post, "u1", 0, 0)
+    assert resp.status_code == 422
 
 
-def test_add_vehicle_right_turn(client):
-    client.post("/api/vehicles", json={"vehicle_id": "rt1", "start_road": 0, "end_road": 3})
-    state = client.get("/api/state").json()
-    north = next(r for r in state["roads"] if r["direction"] == 0)
-    assert north["lanes"]["right"]["queue_length"] == 1
+def test_vehicle_id_whitespace_rejected(client):
+    resp = add_vehicle(client.post, "bad id", 0, 1, validate=False)
+    assert resp.status_code == 422
 
 
-def test_uturn_rejected(client):
-    resp = client.post("/api/vehicles", json={"vehicle_id": "u1", "start_road": 0, "end_road": 0})
-    assert resp.status_code == 422
+def test_add_vehicle_helper_fails_fast_on_bad_id(client):
+    with pytest.raises(ValueError, match="whitespace"):
+        add_vehicle(client.post, "bad id", 0, 1)
 
 
-def test_vehicle_id_whitespace_rejected(client):
-    resp = client.post("/api/vehicles", json={"vehicle_id": "bad id", "start_road": 0, "end_road": 1})
+def test_add_vehicles_bulk(client, mutating_post):
+    resp = mutating_post("/api/vehicles/bulk", json=[
+        {"vehicle_id": "b1", "start_road": 0, "end_road": 1},   # NORTH straight
+        {"vehicle_id": "b2", "start_road": 0, "end_road": 1},   # NORTH straight
+        {"vehicle_id": "b3", "start_road": 2, "end_road": 1},   # EAST left
+    ])
+    assert resp.status_code == 201
+
+    state = client.get("/api/state").json()
+    roads = roads_by_dir(state)
+    north, east = roads[0], roads[2]
+    assert north["lanes"]["straight"]["queue_length"] == 2
+    assert east["lanes"]["left"]["queue_length"] == 1
+
+
+def test_add_vehicles_bulk_uturn_rejects_batch(client):
+    resp = client.post("/api/vehicles/bulk", json=[
+        {"vehicle_id": "b1", "start_road": 0, "end_road": 1},
+        {"vehicle_id": "b2", "start_road": 3, "end_road": 3},
+    ])
     assert resp.status_code == 422
 
+    state = client.get("/api/state").json()
+    north = roads_by_dir(state)[0]
+    assert north["lanes"]["straight"]["queue_length"] == 0
+
 
 # ---------------------------------------------------------------------------
 # Step
 # ---------------------------------------------------------------------------
 
-def test_empty_step_returns_no_departures(client):
-    resp = client.post("/api/step")
-    assert resp.status_code == 200
-    data = resp.json()
-    assert data["left_vehicles"] == []
-    assert data["step_number"] == 1
+def test_empty_step_returns_no_departures(run_step):
+    result = run_step()
+    assert result.left_vehicles == []
+    assert result.step_number == 1
 
 
-def test_step_increments_step_count(client):
-    client.post("/api/step")
-    client.post("/api/step")
-    state = client.get("/api/state").json()
-    assert state["step_count"] == 2
+def test_step_increments_step_count(run_step):
+    run_step()
+    run_step()
+    assert get_state().step_count == 2
 
 
-def test_vehicles_depart_after_step(client):
-    client.post("/api/vehicles", json={"vehicle_id": "dep1", "start_road": 0, "end_road": 1})
-    client.post("/api/vehicles", json={"vehicle_id": "dep2", "start_road": 1, "end_road": 0})
+@pytest.mark.anyio
+async def test_vehicles_depart_after_step(async_mutating_post):
+    await async_mutating_post("/api/vehicles/bulk", json=[
+        {"vehicle_id": "dep1", "start_road": 0, "end_road": 1},
+        {"vehicle_id": "dep2", "start_road": 1, "end_road": 0},
+    ])
     # PHASE_NS is active initially, so North+South straight vehicles depart
-    result = client.post("/api/step").json()
+    result = (await async_mutating_post("/api/step")).json()
     assert "dep1" in result["left_vehicles"]
     assert "dep2" in result["left_vehicles"]
 
 
-def test_queue_decrements_after_departure(client):
-    client.post("/api/vehicles", json={"vehicle_id": "q1", "start_road": 0, "end_road": 1})
+def test_queue_decrements_after_departure(client, mutating_post):
+    add_vehicle(mutating_post, "q1", 0, 1)   # NORTH straight
     before = client.get("/api/state").json()
-    north_before = next(r for r in before["roads"] if r["direction"] == 0)
+    north_before = roads_by_dir(before)[0]
     assert north_before["lanes"]["straight"]["queue_length"] == 1
 
-    client.post("/api/step")
+    mutating_post("/api/step")
     after = client.get("/api/state").json()
-    north_after = next(r for r in after["roads"] if r["direction"] == 0)
+    north_after = roads_by_dir(after)[0]
     assert north_after["lanes"]["straight"]["queue_length"] == 0
 
 
@@ -156,10 +145,10 @@ def test_queue_decrements_after_departure(client):
 # Reset
 # ---------------------------------------------------------------------------
 
-def test_reset_clears_state(client):
-    client.post("/api/vehicles", json={"vehicle_id": "r1", "start_road": 0, "end_road": 1})
-    client.post("/api/step")
-    client.post("/api/reset")
+def test_reset_clears_state(client, mutating_post):
+    add_vehicle(mutating_post, "r1", 0, 1)
+    mutating_post("/api/step")
+    mutating_post("/api/reset")
 
     state = client.get("/api/state").json()
     assert state["step_count"] == 0
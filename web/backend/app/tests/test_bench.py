@@ -0,0 +1,28 @@
+"""Microbenchmark for the /api/step hot path.
+
+Needs pytest-benchmark (``pip install pytest-benchmark``; it is not in
+requirements.txt).  Deselected by default through the ``bench`` marker; run
+it with:
+    pytest web/backend/app/tests/test_bench.py -m bench --benchmark-only
+
+The timings are only reported; nothing fails on a slowdown.
+"""
+
+from __future__ import annotations
+
+import pytest
+
+from .conftest import requires_binary
+
+pytest.importorskip("pytest_benchmark")
+
+pytestmark = [requires_binary, pytest.mark.bench]
+
+
+def test_step_bench(client, benchmark, reset_between_tests):
+    # One long-lived client, so only the step round trip is measured.
+    reset_between_tests.dirty = True
+    def step():
+        assert client.post("/api/step").status_code == 200
+
+    benchmark.pedantic(step, rounds=5, iterations=1000, warmup_rounds=2)
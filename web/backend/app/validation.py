@@ -0,0 +1,19 @@
+"""Input rules shared by the API models and by clients that pre-check input."""
+
+from __future__ import annotations
+
+import re
+
+# MAX_VEHICLE_ID_LEN in config.h, minus the NUL terminator
+VEHICLE_ID_MAX_LEN = 31
+
+_WHITESPACE_RE = re.compile(r"\s")
+
+
+def validate_vehicle_id(vehicle_id: str) -> str:
+    """Return vehicle_id unchanged, or raise ValueError if the API would reject it."""
+    if not 1 <= len(vehicle_id) <= VEHICLE_ID_MAX_LEN:
+        raise ValueError(f"vehicle_id must be 1-{VEHICLE_ID_MAX_LEN} characters")
+    if _WHITESPACE_RE.search(vehicle_id):
+        raise ValueError("vehicle_id must not contain whitespace")
+    return vehicle_id